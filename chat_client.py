@@ -17,7 +17,6 @@ DEFAULT_PORT = 6667  # default port for /connect <server>
 class ChatClient:
     def __init__(self):
         self.sock = None
-        self.sock_file = None  # for readline()
         self.recv_thread = None
         self.running = False
 
@@ -26,6 +25,33 @@ class ChatClient:
         self.client_id = None
         self.server_name = None
 
+        # Dispatch tables built once: the receive path then does a single
+        # dict lookup per message instead of a chain of string compares
+        self._resp_handlers = {
+            CommandName.CONNECT: self._resp_connect,
+            CommandName.LIST: self._resp_list,
+            CommandName.HELP: self._resp_help,
+            CommandName.NICK: self._resp_nick,
+            CommandName.JOIN: self._resp_join,
+            CommandName.LEAVE: self._resp_leave,
+            CommandName.QUIT: self._resp_quit,
+        }
+        self._evt_handlers = {
+            EventName.MESSAGE: self._evt_message,
+            EventName.USER_JOINED: self._evt_user_joined,
+            EventName.USER_LEFT: self._evt_user_left,
+            EventName.SERVER_SHUTDOWN: self._evt_server_shutdown,
+        }
+        self._cmds = {
+            "connect": self._cmd_connect,
+            "help": self._cmd_help,
+            "nick": self._cmd_nick,
+            "list": self._cmd_list,
+            "join": self._cmd_join,
+            "leave": self._cmd_leave,
+            "quit": self._cmd_quit,
+        }
+
     # low-level connection 
 
     def connect(self, host, port):
@@ -36,8 +62,11 @@ class ChatClient:
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((host, port))
-            # text-mode reader; we still send bytes manually
-            self.sock_file = self.sock.makefile("rb")
+            # Disable Nagle's algorithm so small chat lines go out immediately
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Generous kernel buffers to ride out bursts from busy channels
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
             self.running = True
 
             # Start receiver thread
@@ -58,13 +87,6 @@ class ChatClient:
 
     def cleanup(self):
         self.running = False
-        if self.sock_file is not None:
-            try:
-                self.sock_file.close()
-            except Exception:
-                pass
-            self.sock_file = None
-
         if self.sock is not None:
             try:
                 self.sock.close()
@@ -80,38 +102,81 @@ class ChatClient:
 
     def send_message(self, msg):
         """Send a Message instance using Protocol.encode()."""
+        if not self.sock:
+            print("[ERROR] Not connected. Use /connect first.")
+            return
+        self.send_raw(Protocol.encode(msg))
+
+    def send_raw(self, data):
+        """Send already-encoded frame bytes (e.g. Protocol.cmd_list_bytes())."""
         if not self.sock:
             print("[ERROR] Not connected. Use /connect first.")
             return
         try:
-            data = Protocol.encode(msg)
             self.sock.sendall(data)
         except Exception as e:
             print(f"[ERROR] Failed to send data: {e}")
             self.disconnect()
 
     def recv_loop(self):
-        """Background thread to receive lines from the server."""
-        while self.running and self.sock_file:
+        """Background thread to receive lines from the server.
+
+        Reads with recv_into() into one reusable buffer and frames lines
+        by scanning for '\\n', so there is no BufferedReader layer and no
+        fresh bytes object allocated per received message.
+        """
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        start = 0  # first unconsumed byte
+        end = 0    # one past the last received byte
+
+        while self.running and self.sock:
             try:
-                line = self.sock_file.readline()
-                if not line:
+                if end == len(buf):
+                    if start > 0:
+                        # Compact consumed bytes to the front
+                        buf[: end - start] = buf[start:end]
+                        end -= start
+                        start = 0
+                    else:
+                        # Single line larger than the whole buffer: grow it
+                        view.release()
+                        buf.extend(bytes(len(buf)))
+                        view = memoryview(buf)
+
+                n = self.sock.recv_into(view[end:])
+                if n == 0:
                     # EOF -> server closed connection
                     print("\n[INFO] Server closed the connection.")
                     self.disconnect()
                     break
-
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    msg = Protocol.decode(line)
-                except ValueError as e:
-                    print(f"[WARN] Invalid message from server: {e}")
-                    continue
-
-                self.handle_incoming(msg)
+                end += n
+
+                # Drain complete lines from the buffer
+                while True:
+                    idx = buf.find(b"\n", start, end)
+                    if idx < 0:
+                        break
+                    line = bytes(view[start:idx]).strip()
+                    start = idx + 1
+                    if not line:
+                        continue
+
+                    try:
+                        msg = Protocol.decode(line)
+                    except ValueError as e:
+                        print(f"[WARN] Invalid message from server: {e}")
+                        continue
+
+                    self.handle_incoming(msg)
+
+                if start == end:
+                    # Everything consumed; reset to the front
+                    start = end = 0
+                elif start > len(buf) // 2:
+                    buf[: end - start] = buf[start:end]
+                    end -= start
+                    start = 0
 
             except Exception as e:
                 if self.running:
@@ -141,89 +206,95 @@ class ChatClient:
             print(f"[ERROR] {name}: {err}")
             return
 
-        if name == CommandName.CONNECT.value:
-            self.server_name = data.get("server")
-            self.client_id = data.get("client_id")
-            motd = data.get("motd")
-            print(f"[INFO] Connected to server '{self.server_name}' as client {self.client_id}")
-            if motd:
-                print(f"[MOTD] {motd}")
-
-        elif name == CommandName.LIST.value:
-            channels = data.get("channels", [])
-            print("[INFO] Channels:")
-            for ch in channels:
-                cname = ch.get("name", "")
-                users = ch.get("users", 0)
-                print(f"  {cname} ({users} users)")
-
-        elif name == CommandName.HELP.value:
-            commands = data.get("commands", [])
-            print("[INFO] Available commands from server:")
-            for line in commands:
-                print(f"  {line}")
-
-        elif name == CommandName.NICK.value:
-            nick = data.get("nickname")
-            if nick:
-                self.nickname = nick
-                print(f"[INFO] Nickname set to {nick}")
-            else:
-                print("[INFO] Nickname updated.")
-
-        elif name == CommandName.JOIN.value:
-            ch = data.get("channel")
-            if ch:
-                self.current_channel = ch
-                print(f"[INFO] Joined channel {ch}")
-            else:
-                print("[INFO] Join success.")
+        handler = self._resp_handlers.get(name)
+        if handler is not None:
+            handler(data)
+        else:
+            print(f"[INFO] {name} OK: {data}")
 
-        elif name == CommandName.LEAVE.value:
-            ch = data.get("channel")
-            if ch and self.current_channel == ch:
-                self.current_channel = None
-                print(f"[INFO] Left channel {ch}")
-            else:
-                print("[INFO] Leave success.")
+    def _resp_connect(self, data):
+        self.server_name = data.get("server")
+        self.client_id = data.get("client_id")
+        motd = data.get("motd")
+        print(f"[INFO] Connected to server '{self.server_name}' as client {self.client_id}")
+        if motd:
+            print(f"[MOTD] {motd}")
+
+    def _resp_list(self, data):
+        channels = data.get("channels", [])
+        print("[INFO] Channels:")
+        for ch in channels:
+            cname = ch.get("name", "")
+            users = ch.get("users", 0)
+            print(f"  {cname} ({users} users)")
+
+    def _resp_help(self, data):
+        commands = data.get("commands", [])
+        print("[INFO] Available commands from server:")
+        for line in commands:
+            print(f"  {line}")
+
+    def _resp_nick(self, data):
+        nick = data.get("nickname")
+        if nick:
+            self.nickname = nick
+            print(f"[INFO] Nickname set to {nick}")
+        else:
+            print("[INFO] Nickname updated.")
 
-        elif name == CommandName.QUIT.value:
-            print("[INFO] Quit acknowledged by server.")
+    def _resp_join(self, data):
+        ch = data.get("channel")
+        if ch:
+            self.current_channel = ch
+            print(f"[INFO] Joined channel {ch}")
+        else:
+            print("[INFO] Join success.")
 
+    def _resp_leave(self, data):
+        ch = data.get("channel")
+        if ch and self.current_channel == ch:
+            self.current_channel = None
+            print(f"[INFO] Left channel {ch}")
         else:
-            print(f"[INFO] {name} OK: {data}")
+            print("[INFO] Leave success.")
+
+    def _resp_quit(self, data):
+        print("[INFO] Quit acknowledged by server.")
 
     def handle_event(self, msg):
         """Handle async events broadcast by the server."""
         name = msg.name
         data = msg.data or {}
 
-        if name == EventName.MESSAGE.value:
-            channel = data.get("channel", "")
-            sender = data.get("from", "<?>")
-            text = data.get("text", "")
-            if channel:
-                print(f"[{channel}] {sender}: {text}")
-            else:
-                print(f"{sender}: {text}")
+        handler = self._evt_handlers.get(name)
+        if handler is not None:
+            handler(data)
+        else:
+            print(f"[INFO] Event {name}: {data}")
 
-        elif name == EventName.USER_JOINED.value:
-            channel = data.get("channel", "")
-            user = data.get("user", "")
-            print(f"[INFO] {user} joined {channel}")
+    def _evt_message(self, data):
+        channel = data.get("channel", "")
+        sender = data.get("from", "<?>")
+        text = data.get("text", "")
+        if channel:
+            print(f"[{channel}] {sender}: {text}")
+        else:
+            print(f"{sender}: {text}")
 
-        elif name == EventName.USER_LEFT.value:
-            channel = data.get("channel", "")
-            user = data.get("user", "")
-            print(f"[INFO] {user} left {channel}")
+    def _evt_user_joined(self, data):
+        channel = data.get("channel", "")
+        user = data.get("user", "")
+        print(f"[INFO] {user} joined {channel}")
 
-        elif name == EventName.SERVER_SHUTDOWN.value:
-            reason = data.get("reason", "Server is shutting down.")
-            print(f"[INFO] SERVER_SHUTDOWN: {reason}")
-            self.disconnect()
+    def _evt_user_left(self, data):
+        channel = data.get("channel", "")
+        user = data.get("user", "")
+        print(f"[INFO] {user} left {channel}")
 
-        else:
-            print(f"[INFO] Event {name}: {data}")
+    def _evt_server_shutdown(self, data):
+        reason = data.get("reason", "Server is shutting down.")
+        print(f"[INFO] SERVER_SHUTDOWN: {reason}")
+        self.disconnect()
 
     # user input handling 
 
@@ -239,85 +310,82 @@ class ChatClient:
             cmd = parts[0].lower()
             args = parts[1:]
 
-            if cmd == "connect":
-                if len(args) < 1:
-                    print("Usage: /connect <server-name> [port]")
-                    return
-                host = args[0]
-                port = int(args[1]) if len(args) > 1 else DEFAULT_PORT
-                self.connect(host, port)
-                return
-
-            if cmd == "help":
-                if not self.sock:
-                    self.print_local_help()
-                    return
-                msg = Protocol.cmd_help()
-                self.send_message(msg)
-                return
+            handler = self._cmds.get(cmd)
+            if handler is not None:
+                handler(args)
+            else:
+                print(f"[ERROR] Unknown command '/{cmd}'. Type /help.")
+            return
 
-            if cmd == "nick":
-                if len(args) != 1:
-                    print("Usage: /nick <nickname>")
-                    return
-                nick = args[0]
-                msg = Protocol.cmd_nick(nick)
-                self.send_message(msg)
-                return
+        # plain chat text
+        if not self.sock:
+            print("[ERROR] Not connected. Use /connect first.")
+            return
+        if not self.current_channel:
+            print("[ERROR] You are not in any channel. Use /join <channel>.")
+            return
 
-            if cmd == "list":
-                if not self.sock:
-                    print("[ERROR] Not connected.")
-                    return
-                msg = Protocol.cmd_list()
-                self.send_message(msg)
-                return
+        msg = Protocol.cmd_msg(line, channel=self.current_channel)
+        self.send_message(msg)
 
-            if cmd == "join":
-                if not self.sock:
-                    print("[ERROR] Not connected.")
-                    return
-                if len(args) != 1:
-                    print("Usage: /join <channel>")
-                    return
-                channel = args[0]
-                msg = Protocol.cmd_join(channel)
-                self.send_message(msg)
-                self.current_channel = channel
-                return
+    def _cmd_connect(self, args):
+        if len(args) < 1:
+            print("Usage: /connect <server-name> [port]")
+            return
+        host = args[0]
+        port = int(args[1]) if len(args) > 1 else DEFAULT_PORT
+        self.connect(host, port)
 
-            if cmd == "leave":
-                if not self.sock:
-                    print("[ERROR] Not connected.")
-                    return
-                channel = args[0] if len(args) >= 1 else None
-                msg = Protocol.cmd_leave(channel)
-                self.send_message(msg)
-                if channel is None or self.current_channel == channel:
-                    self.current_channel = None
-                return
+    def _cmd_help(self, args):
+        if not self.sock:
+            self.print_local_help()
+            return
+        self.send_raw(Protocol.cmd_help_bytes())
 
-            if cmd == "quit":
-                reason = " ".join(args) if args else None
-                if self.sock:
-                    msg = Protocol.cmd_quit(reason)
-                    self.send_message(msg)
-                self.disconnect()
-                sys.exit(0)
+    def _cmd_nick(self, args):
+        if len(args) != 1:
+            print("Usage: /nick <nickname>")
+            return
+        msg = Protocol.cmd_nick(args[0])
+        self.send_message(msg)
 
-            print(f"[ERROR] Unknown command '/{cmd}'. Type /help.")
+    def _cmd_list(self, args):
+        if not self.sock:
+            print("[ERROR] Not connected.")
             return
+        self.send_raw(Protocol.cmd_list_bytes())
 
-        # plain chat text
+    def _cmd_join(self, args):
         if not self.sock:
-            print("[ERROR] Not connected. Use /connect first.")
+            print("[ERROR] Not connected.")
             return
-        if not self.current_channel:
-            print("[ERROR] You are not in any channel. Use /join <channel>.")
+        if len(args) != 1:
+            print("Usage: /join <channel>")
             return
+        channel = args[0]
+        msg = Protocol.cmd_join(channel)
+        self.send_message(msg)
+        self.current_channel = channel
 
-        msg = Protocol.cmd_msg(line, channel=self.current_channel)
+    def _cmd_leave(self, args):
+        if not self.sock:
+            print("[ERROR] Not connected.")
+            return
+        channel = args[0] if len(args) >= 1 else None
+        msg = Protocol.cmd_leave(channel)
         self.send_message(msg)
+        if channel is None or self.current_channel == channel:
+            self.current_channel = None
+
+    def _cmd_quit(self, args):
+        reason = " ".join(args) if args else None
+        if self.sock:
+            if reason is None:
+                self.send_raw(Protocol.cmd_quit_bytes())
+            else:
+                self.send_message(Protocol.cmd_quit(reason))
+        self.disconnect()
+        sys.exit(0)
 
     def print_local_help(self):
         print("Local commands:")
@@ -1,322 +1,359 @@
 #!/usr/bin/env python3
-import socket
-import threading
+import asyncio
 import argparse
-import sys
+import socket
 import time
+from collections import defaultdict
+
+try:
+    import uvloop  # optional faster event loop; falls back to stdlib asyncio
+except ImportError:
+    uvloop = None
+
 from protocol import Protocol, MessageType, CommandName, EventName
 
+# Command names resolved once at import time so the per-message dispatch
+# compares plain strings instead of doing Enum attribute lookups.
+_CMD_CONNECT = CommandName.CONNECT
+_CMD_NICK = CommandName.NICK
+_CMD_LIST = CommandName.LIST
+_CMD_JOIN = CommandName.JOIN
+_CMD_LEAVE = CommandName.LEAVE
+_CMD_QUIT = CommandName.QUIT
+_CMD_HELP = CommandName.HELP
+_CMD_MSG = CommandName.MSG
+
 class ChatServer:
     def __init__(self, port, debug_level):
         self.port = port
         self.debug_level = debug_level
-        self.server_socket = None
+        self.server = None
         self.running = False
         self.last_activity = time.time()
         self.idle_timeout = 180  # 3 minutes in seconds
-        
+
         # Server state
-        self.clients = {}  # {client_socket: {"nickname": str, "channels": set()}}
-        self.channels = {}  # {channel_name: set(client_sockets)}
-        self.client_lock = threading.Lock()
-        
-        # Thread pool
-        self.max_threads = 4
-        self.active_threads = 0
-        self.thread_semaphore = threading.Semaphore(self.max_threads)
-        
+        # All coroutines run on the single event-loop thread, so the
+        # dicts below can be mutated without locking.
+        self.clients = {}  # {writer: {"nickname": str, "channels": set()}}
+        self.nicknames = {}  # {nickname: writer} inverted index for uniqueness checks
+        # Channel membership as a list (contiguous iteration for broadcast)
+        # plus a position map for O(1) membership checks and removal
+        self.channels = {}  # {channel_name: [writers]}
+        self._pos = {}  # {channel_name: {writer: index into the list}}
+        # Pre-serialized JSON literal per channel name, for evt_message_fast
+        self._channel_json = {}  # {channel_name: '"#name"'}
+        self._pending = defaultdict(list)  # {writer: [encoded frames]} awaiting flush
+
+        # Command dispatch table: one dict lookup per message instead of
+        # an if/elif chain of string compares
+        self._handlers = {
+            _CMD_NICK: self._handle_nick,
+            _CMD_LIST: self._handle_list,
+            _CMD_JOIN: self._handle_join,
+            _CMD_LEAVE: self._handle_leave,
+            _CMD_MSG: self._handle_msg,
+            _CMD_HELP: self._handle_help,
+            _CMD_QUIT: self._handle_quit,
+            _CMD_CONNECT: self._handle_connect,
+        }
+
+        self._stopped = None  # set in serve()
+
+        # Log timestamp cache: strftime is only re-run when the second changes
+        self._ts_cached_sec = 0
+        self._ts_cached_str = ""
+
     def log(self, message, level=0):
         """Log messages based on debug level (0=errors only, 1=all events)"""
         if level <= self.debug_level:
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            print(f"[{timestamp}] {message}")
-    
-    def start(self):
+            now = int(time.time())
+            if now != self._ts_cached_sec:
+                self._ts_cached_sec = now
+                self._ts_cached_str = time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(now)
+                )
+            print(f"[{self._ts_cached_str}] {message}")
+
+    async def serve(self):
         """Start the chat server"""
+        self.server = await asyncio.start_server(
+            self._handle_client, '0.0.0.0', self.port
+        )
+        self.running = True
+        self._stopped = asyncio.Event()
+
+        self.log(f"ChatServer started on port {self.port}", 1)
+        self.log(f"Debug level: {self.debug_level}", 1)
+
+        # Start idle checker task
+        idle_task = asyncio.create_task(self._check_idle())
+
         try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.bind(('0.0.0.0', self.port))
-            self.server_socket.listen(5)
-            self.server_socket.settimeout(1.0)  # Timeout for accept() to check running flag
-            self.running = True
-            
-            self.log(f"ChatServer started on port {self.port}", 1)
-            self.log(f"Debug level: {self.debug_level}", 1)
-            self.log(f"Max threads: {self.max_threads}", 1)
-            
-            # Start idle checker thread
-            idle_thread = threading.Thread(target=self._check_idle, daemon=True)
-            idle_thread.start()
-            
-            # Main accept loop
-            while self.running:
-                try:
-                    client_socket, address = self.server_socket.accept()
-                    self.log(f"New connection from {address}", 1)
-                    self.last_activity = time.time()
-                    
-                    # Start client handler thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client_socket, address),
-                        daemon=True
-                    )
-                    client_thread.start()
-                    
-                except socket.timeout:
-                    continue  # Check running flag and continue
-                except OSError:
-                    if self.running:
-                        self.log("Error accepting connection", 0)
-                    break
-                    
-        except KeyboardInterrupt:
-            self.log("\nReceived Ctrl-C, shutting down...", 1)
-        except Exception as e:
-            self.log(f"Server error: {e}", 0)
+            async with self.server:
+                await self._stopped.wait()
         finally:
-            self.shutdown()
-    
-    def _check_idle(self):
+            idle_task.cancel()
+            await self.shutdown()
+
+    async def _check_idle(self):
         """Check for idle timeout and shutdown if needed"""
         while self.running:
-            time.sleep(10)  # Check every 10 seconds
-            with self.client_lock:
-                if len(self.clients) == 0:
-                    idle_time = time.time() - self.last_activity
-                    if idle_time > self.idle_timeout:
-                        self.log(f"Server idle for {int(idle_time)} seconds, shutting down...", 1)
-                        self.running = False
-                        break
-    
-    def _handle_client(self, client_socket, address):
+            await asyncio.sleep(10)  # Check every 10 seconds
+            if len(self.clients) == 0:
+                idle_time = time.time() - self.last_activity
+                if idle_time > self.idle_timeout:
+                    self.log(f"Server idle for {int(idle_time)} seconds, shutting down...", 1)
+                    self.running = False
+                    self._stopped.set()
+                    break
+
+    async def _handle_client(self, reader, writer):
         """Handle a single client connection"""
-        # Acquire thread semaphore (limit concurrent threads)
-        self.thread_semaphore.acquire()
-        
+        address = writer.get_extra_info('peername')
+        self.log(f"New connection from {address}", 1)
+        self.last_activity = time.time()
+
+        # Disable Nagle's algorithm: chat frames are tiny, and waiting to
+        # coalesce them adds up to ~40ms latency per message
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Generous kernel buffers so bursts are absorbed without
+            # extra syscalls or sender-side stalls
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+
+        nickname = f"user_{address[1]}"  # Default nickname
+        self.clients[writer] = {
+            "nickname": nickname,
+            "nick_json": Protocol.encode_str(nickname),  # cached for evt_message_fast
+            "channels": set(),
+            "current": None,  # most recently joined channel, for /leave and msg defaults
+            "address": address
+        }
+        self.nicknames[nickname] = writer
+
+        # Send welcome message
+        welcome = Protocol.resp_connected(
+            server_name=f"ChatServer:{self.port}",
+            client_id=str(address[1]),
+            motd="Welcome to the chat server!"
+        )
+        self._send_message(writer, welcome)
+        await self._flush(writer)
+
         try:
-            with self.client_lock:
-                self.clients[client_socket] = {
-                    "nickname": f"user_{address[1]}",  # Default nickname
-                    "channels": set(),
-                    "address": address
-                }
-            
-            self.log(f"Client handler started for {address}", 1)
-            
-            # Send welcome message
-            welcome = Protocol.resp_connected(
-                server_name=f"ChatServer:{self.port}",
-                client_id=str(address[1]),
-                motd="Welcome to the chat server!"
-            )
-            self._send_message(client_socket, welcome)
-            
-            # Buffer for incomplete messages
-            buffer = ""
-            
+            # Leftover partial frame carried between reads; everything up
+            # to the last newline of each read is decoded in one batch
+            leftover = b""
             while self.running:
-                try:
-                    # Receive data
-                    data = client_socket.recv(4096).decode('utf-8')
-                    if not data:
-                        self.log(f"Client {address} disconnected", 1)
-                        break
-                    
-                    buffer += data
-                    
-                    # Process complete messages (lines ending in \n)
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        if line:
-                            self._process_message(client_socket, line + '\n')
-                            self.last_activity = time.time()
-                
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    self.log(f"Error handling client {address}: {e}", 0)
+                data = await reader.read(65536)
+                if not data:
+                    self.log(f"Client {address} disconnected", 1)
                     break
-        
+
+                head, sep, leftover = (leftover + data).rpartition(b"\n")
+                if sep:
+                    await self._process_frames(writer, head)
+                    self.last_activity = time.time()
+
+        except Exception as e:
+            self.log(f"Error handling client {address}: {e}", 0)
+
         finally:
             # Clean up client
-            self._disconnect_client(client_socket)
-            self.thread_semaphore.release()
-    
-    def _process_message(self, client_socket, line):
-        """Process a single message from a client"""
+            await self._disconnect_client(writer)
+
+    async def _process_frames(self, writer, data):
+        """
+        Decode a batch of complete frames from a client and dispatch each.
+
+        Frames are still split with one C-level bytes.split, but decoded
+        one at a time so a malformed line only costs itself an error
+        response: valid frames before and after it in the same TCP read
+        are dispatched normally.
+        """
+        for line in data.split(b"\n"):
+            if not line:
+                continue
+            try:
+                msg = Protocol.decode(line)
+            except ValueError as e:
+                self.log(f"Invalid message: {e}", 0)
+                self._send_error(writer, "unknown", "Invalid message format")
+                await self._flush(writer)
+                continue
+            await self._process_message(writer, msg)
+
+    async def _process_message(self, writer, msg):
+        """Process a single decoded message from a client"""
         try:
-            msg = Protocol.decode(line)
-            self.log(f"Received: {msg}", 1)
-            
+            # Skip building the (repr-heavy) log string when it would be dropped
+            if self.debug_level:
+                self.log(f"Received: {msg}", 1)
+
             if msg.type != MessageType.COMMAND:
-                self._send_error(client_socket, "unknown", "Expected command message")
+                self._send_error(writer, "unknown", "Expected command message")
                 return
-            
+
             # Route to command handlers
-            if msg.name == CommandName.NICK.value:
-                self._handle_nick(client_socket, msg)
-            elif msg.name == CommandName.LIST.value:
-                self._handle_list(client_socket, msg)
-            elif msg.name == CommandName.JOIN.value:
-                self._handle_join(client_socket, msg)
-            elif msg.name == CommandName.LEAVE.value:
-                self._handle_leave(client_socket, msg)
-            elif msg.name == CommandName.MSG.value:
-                self._handle_msg(client_socket, msg)
-            elif msg.name == CommandName.HELP.value:
-                self._handle_help(client_socket, msg)
-            elif msg.name == CommandName.QUIT.value:
-                self._handle_quit(client_socket, msg)
-            elif msg.name == CommandName.CONNECT.value:
-                # Important: handle /connect (even though client already does TCP connect)
-                # Returning resp_connected is valid
-                return
+            handler = self._handlers.get(msg.name)
+            if handler is not None:
+                await handler(writer, msg)
             else:
-                self._send_error(client_socket, msg.name, "Unknown command")
-        
-        except ValueError as e:
-            self.log(f"Invalid message: {e}", 0)
-            self._send_error(client_socket, "unknown", "Invalid message format")
-    
-    def _handle_nick(self, client_socket, msg):
+                self._send_error(writer, msg.name, "Unknown command")
+
+        finally:
+            # One gathered write for everything this command queued
+            await self._flush(writer)
+
+    async def _handle_connect(self, writer, msg):
+        """Handle /connect command
+
+        The client already did the TCP connect and got resp_connected in
+        the welcome, so there is nothing left to do here.
+        """
+        return
+
+    async def _handle_nick(self, writer, msg):
         """Handle /nick command"""
         nickname = msg.data.get("nickname", "").strip()
-        
+
         # Validate nickname
         if not nickname or len(nickname) > 20 or not nickname.replace('_', '').isalnum():
-            self._send_error(client_socket, CommandName.NICK, "Invalid nickname format")
+            self._send_error(writer, CommandName.NICK, "Invalid nickname format")
+            return
+
+        # Check if nickname is taken (O(1) via the inverted index)
+        owner = self.nicknames.get(nickname)
+        if owner is not None and owner is not writer:
+            self._send_error(writer, CommandName.NICK, "Nickname already in use")
             return
-        
-        # Check if nickname is taken
-        with self.client_lock:
-            for client, info in self.clients.items():
-                if client != client_socket and info["nickname"] == nickname:
-                    self._send_error(client_socket, CommandName.NICK, "Nickname already in use")
-                    return
-            
-            # Set nickname
-            self.clients[client_socket]["nickname"] = nickname
-        
+
+        # Set nickname (and refresh the index and cached JSON literal)
+        old_nickname = self.clients[writer]["nickname"]
+        self.nicknames.pop(old_nickname, None)
+        self.nicknames[nickname] = writer
+        self.clients[writer]["nickname"] = nickname
+        self.clients[writer]["nick_json"] = Protocol.encode_str(nickname)
+
         self.log(f"Client set nickname to: {nickname}", 1)
         response = Protocol.resp_ok(CommandName.NICK, {"nickname": nickname})
-        self._send_message(client_socket, response)
-    
-    def _handle_list(self, client_socket, msg):
+        self._send_message(writer, response)
+
+    async def _handle_list(self, writer, msg):
         """Handle /list command"""
-        with self.client_lock:
-            channels = []
-            for channel_name, members in self.channels.items():
-                channels.append({
-                    "name": channel_name,
-                    "users": len(members)
-                })
-        
+        channels = []
+        for channel_name, members in self.channels.items():
+            channels.append({
+                "name": channel_name,
+                "users": len(members)
+            })
+
         response = Protocol.resp_list_channels(channels)
-        self._send_message(client_socket, response)
-    
-    def _handle_join(self, client_socket, msg):
+        self._send_message(writer, response)
+
+    async def _handle_join(self, writer, msg):
         """Handle /join command"""
         channel = msg.data.get("channel", "").strip()
-        
+
         # Validate channel name
         if not channel or not channel.startswith('#') or len(channel) < 2:
-            self._send_error(client_socket, CommandName.JOIN, "Invalid channel name")
+            self._send_error(writer, CommandName.JOIN, "Invalid channel name")
             return
-        
-        with self.client_lock:
-            # Create channel if it doesn't exist
-            if channel not in self.channels:
-                self.channels[channel] = set()
-            
-            # Add client to channel
-            self.channels[channel].add(client_socket)
-            self.clients[client_socket]["channels"].add(channel)
-            
-            nickname = self.clients[client_socket]["nickname"]
-        
+
+        # Add client to channel (creating the channel if needed)
+        self._add_to_channel(channel, writer)
+        self.clients[writer]["channels"].add(channel)
+        self.clients[writer]["current"] = channel
+
+        nickname = self.clients[writer]["nickname"]
+
         self.log(f"{nickname} joined {channel}", 1)
-        
+
         # Send success response
         response = Protocol.resp_ok(CommandName.JOIN, {"channel": channel})
-        self._send_message(client_socket, response)
-        
+        self._send_message(writer, response)
+
         # Broadcast join event to all users in channel
         join_event = Protocol.evt_user_joined(channel, nickname)
-        self._broadcast_to_channel(channel, join_event, exclude=client_socket)
-    
-    def _handle_leave(self, client_socket, msg):
+        await self._broadcast_to_channel(channel, join_event, exclude=writer)
+
+    async def _handle_leave(self, writer, msg):
         """Handle /leave command"""
         channel = msg.data.get("channel")
-        
-        with self.client_lock:
-            client_channels = self.clients[client_socket]["channels"]
-            
-            # If no channel specified, leave current channel (first one)
-            if not channel:
-                if client_channels:
-                    channel = list(client_channels)[0]
-                else:
-                    self._send_error(client_socket, CommandName.LEAVE, "Not in any channel")
-                    return
-            
-            # Remove client from channel
-            if channel in client_channels:
-                self.channels[channel].discard(client_socket)
-                client_channels.remove(channel)
-                
-                # Remove empty channels
-                if len(self.channels[channel]) == 0:
-                    del self.channels[channel]
-                
-                nickname = self.clients[client_socket]["nickname"]
-            else:
-                self._send_error(client_socket, CommandName.LEAVE, "Not in that channel")
+
+        info = self.clients[writer]
+        client_channels = info["channels"]
+
+        # If no channel specified, leave the client's current channel
+        if not channel:
+            channel = info["current"]
+            if channel is None:
+                self._send_error(writer, CommandName.LEAVE, "Not in any channel")
                 return
-        
+
+        # Remove client from channel
+        if channel in client_channels:
+            self._remove_from_channel(channel, writer)
+            client_channels.remove(channel)
+
+            # Fall back to any remaining channel as the new current one
+            if info["current"] == channel:
+                info["current"] = next(iter(client_channels)) if client_channels else None
+
+            nickname = info["nickname"]
+        else:
+            self._send_error(writer, CommandName.LEAVE, "Not in that channel")
+            return
+
         self.log(f"{nickname} left {channel}", 1)
-        
+
         # Send success response
         response = Protocol.resp_ok(CommandName.LEAVE, {"channel": channel})
-        self._send_message(client_socket, response)
-        
+        self._send_message(writer, response)
+
         # Broadcast leave event
         leave_event = Protocol.evt_user_left(channel, nickname)
-        self._broadcast_to_channel(channel, leave_event)
-    
-    def _handle_msg(self, client_socket, msg):
+        await self._broadcast_to_channel(channel, leave_event)
+
+    async def _handle_msg(self, writer, msg):
         """Handle chat message"""
         text = msg.data.get("text", "").strip()
         channel = msg.data.get("channel")
-        
+
         if not text:
             return
-        
-        with self.client_lock:
-            client_channels = self.clients[client_socket]["channels"]
-            nickname = self.clients[client_socket]["nickname"]
-            
-            # If no channel specified, use first joined channel
-            if not channel:
-                if client_channels:
-                    channel = list(client_channels)[0]
-                else:
-                    self._send_error(client_socket, CommandName.MSG, "Not in any channel")
-                    return
-            
-            # Check if client is in the channel
-            if channel not in client_channels:
-                self._send_error(client_socket, CommandName.MSG, "Not in that channel")
+
+        info = self.clients[writer]
+        client_channels = info["channels"]
+        nickname = info["nickname"]
+
+        # If no channel specified, use the client's current channel
+        if not channel:
+            channel = info["current"]
+            if channel is None:
+                self._send_error(writer, CommandName.MSG, "Not in any channel")
                 return
-        
+
+        # Check if client is in the channel
+        if channel not in client_channels:
+            self._send_error(writer, CommandName.MSG, "Not in that channel")
+            return
+
         self.log(f"[{channel}] {nickname}: {text}", 1)
-        
-        # Broadcast message to all users in channel
-        message_event = Protocol.evt_message(channel, nickname, text)
-        self._broadcast_to_channel(channel, message_event)
-    
-    def _handle_help(self, client_socket, msg):
+
+        # Broadcast message to all users in channel. Channel and nickname
+        # JSON literals are cached, so only the text is serialized here.
+        data = Protocol.evt_message_fast(
+            self._channel_json[channel],
+            self.clients[writer]["nick_json"],
+            text,
+        )
+        await self._broadcast_bytes(channel, data)
+
+    async def _handle_help(self, writer, msg):
         """Handle /help command"""
         commands = [
             "/connect <server> [port] - Connect to server",
@@ -328,107 +365,208 @@ class ChatServer:
             "/help - Show this help message"
         ]
         response = Protocol.resp_help(commands)
-        self._send_message(client_socket, response)
-    
-    def _handle_quit(self, client_socket, msg):
+        self._send_message(writer, response)
+
+    async def _handle_quit(self, writer, msg):
         """Handle /quit command"""
         reason = msg.data.get("reason", "Client quit")
         self.log(f"Client requested quit: {reason}", 1)
-        
+
         response = Protocol.resp_ok(CommandName.QUIT)
-        self._send_message(client_socket, response)
-        
+        self._send_message(writer, response)
+
         # Client will be cleaned up in _handle_client
-    
-    def _send_message(self, client_socket, message):
-        """Send a message to a specific client"""
-        try:
-            data = Protocol.encode(message)
-            client_socket.sendall(data)
+
+    def _add_to_channel(self, channel, writer):
+        """Add a client to a channel's member list (idempotent, O(1))"""
+        if channel not in self.channels:
+            self.channels[channel] = []
+            self._pos[channel] = {}
+            self._channel_json[channel] = Protocol.encode_str(channel)
+        pos = self._pos[channel]
+        if writer not in pos:
+            pos[writer] = len(self.channels[channel])
+            self.channels[channel].append(writer)
+
+    def _remove_from_channel(self, channel, writer):
+        """
+        Remove a client from a channel's member list, O(1).
+
+        Swaps the departing client with the tail of the list and pops, so
+        removal never shifts the rest of the members. Empty channels are
+        deleted. Returns True if the client was a member.
+        """
+        members = self.channels.get(channel)
+        if members is None:
+            return False
+        pos = self._pos[channel]
+        if writer not in pos:
+            return False
+
+        i = pos.pop(writer)
+        last = members.pop()
+        if last is not writer:
+            members[i] = last
+            pos[last] = i
+
+        if not members:
+            del self.channels[channel]
+            del self._pos[channel]
+            del self._channel_json[channel]
+        return True
+
+    def _send_message(self, writer, message):
+        """
+        Queue a message for a specific client.
+
+        Frames accumulate in self._pending and are written out together by
+        _flush, so a command that produces several frames for the same
+        client costs one gathered write instead of one write per frame.
+        """
+        self._pending[writer].append(Protocol.encode(message))
+        if self.debug_level:
             self.log(f"Sent: {message}", 1)
+
+    async def _flush(self, writer):
+        """Write all queued frames for a client in one gathered write"""
+        frames = self._pending.pop(writer, None)
+        if not frames:
+            return
+        try:
+            writer.writelines(frames)
+            await writer.drain()
         except Exception as e:
             self.log(f"Error sending message: {e}", 0)
-    
-    def _send_error(self, client_socket, command_name, error_msg):
-        """Send an error response to a client"""
+
+    def _send_error(self, writer, command_name, error_msg):
+        """Queue an error response to a client"""
         error = Protocol.resp_error(command_name, error_msg)
-        self._send_message(client_socket, error)
-    
-    def _broadcast_to_channel(self, channel, message, exclude=None):
-        """Broadcast a message to all clients in a channel"""
-        with self.client_lock:
-            if channel in self.channels:
-                for client_socket in self.channels[channel]:
-                    if client_socket != exclude:
-                        self._send_message(client_socket, message)
-    
-    def _disconnect_client(self, client_socket):
+        self._send_message(writer, error)
+
+    async def _broadcast_to_channel(self, channel, messages, exclude=None):
+        """
+        Broadcast one message (or a list of messages) to all clients in a channel.
+
+        All frames are encoded up front and written to each recipient as a
+        single batch, so a multi-frame burst costs one write per recipient
+        instead of one per frame.
+        """
+        if channel not in self.channels:
+            return
+
+        if not isinstance(messages, list):
+            messages = [messages]
+        data = b"".join(Protocol.encode_once(m) for m in messages)
+
+        await self._broadcast_bytes(channel, data, exclude)
+        if self.debug_level:
+            for m in messages:
+                self.log(f"Broadcast to {channel}: {m}", 1)
+
+    async def _broadcast_bytes(self, channel, data, exclude=None):
+        """
+        Write pre-encoded payload bytes to every client in a channel.
+
+        The payload is encoded exactly once by the caller, so the fan-out
+        loop is a plain write per recipient with no per-recipient
+        serialization or logging.
+
+        Membership is snapshotted up front: the buffered writes themselves
+        never block, and the drain below is the only await, so joins and
+        leaves that land while recipients are being flushed cannot change
+        who this broadcast goes to.
+        """
+        members = self.channels.get(channel)
+        if not members:
+            return
+
+        recipients = []
+        for writer in tuple(members):
+            if writer is not exclude:
+                try:
+                    writer.write(data)
+                    recipients.append(writer)
+                except Exception as e:
+                    self.log(f"Error broadcasting to client: {e}", 0)
+
+        # Flush all recipients concurrently
+        if recipients:
+            await asyncio.gather(
+                *(w.drain() for w in recipients), return_exceptions=True
+            )
+
+    async def _disconnect_client(self, writer):
         """Clean up a disconnected client"""
-        with self.client_lock:
-            if client_socket in self.clients:
-                client_info = self.clients[client_socket]
-                nickname = client_info["nickname"]
-                
-                # Remove from all channels
-                for channel in list(client_info["channels"]):
-                    if channel in self.channels:
-                        self.channels[channel].discard(client_socket)
-                        
-                        # Broadcast leave event
-                        leave_event = Protocol.evt_user_left(channel, nickname)
-                        self._broadcast_to_channel(channel, leave_event)
-                        
-                        # Remove empty channels
-                        if len(self.channels[channel]) == 0:
-                            del self.channels[channel]
-                
-                # Remove client
-                del self.clients[client_socket]
-                self.log(f"Client {nickname} disconnected and cleaned up", 1)
-        
+        if writer in self.clients:
+            client_info = self.clients[writer]
+            nickname = client_info["nickname"]
+
+            # Remove from all channels
+            for channel in list(client_info["channels"]):
+                if self._remove_from_channel(channel, writer):
+                    # Broadcast leave event to remaining members
+                    leave_event = Protocol.evt_user_left(channel, nickname)
+                    await self._broadcast_to_channel(channel, leave_event)
+
+            # Remove client
+            del self.clients[writer]
+            self.nicknames.pop(nickname, None)
+            self._pending.pop(writer, None)
+            self.log(f"Client {nickname} disconnected and cleaned up", 1)
+
         try:
-            client_socket.close()
-        except:
+            writer.close()
+        except Exception:
             pass
-    
-    def shutdown(self):
+
+    async def shutdown(self):
         """Shutdown the server gracefully"""
         self.log("Shutting down server...", 1)
         self.running = False
-        
+
         # Notify all clients
         shutdown_event = Protocol.evt_server_shutdown("Server shutting down")
-        with self.client_lock:
-            for client_socket in list(self.clients.keys()):
-                try:
-                    self._send_message(client_socket, shutdown_event)
-                    client_socket.close()
-                except:
-                    pass
-            self.clients.clear()
-            self.channels.clear()
-        
+        for writer in list(self.clients.keys()):
+            try:
+                self._send_message(writer, shutdown_event)
+                await self._flush(writer)
+                writer.close()
+            except Exception:
+                pass
+        self.clients.clear()
+        self.nicknames.clear()
+        self.channels.clear()
+        self._pos.clear()
+        self._channel_json.clear()
+
         # Close server socket
-        if self.server_socket:
+        if self.server:
+            self.server.close()
             try:
-                self.server_socket.close()
-            except:
+                await self.server.wait_closed()
+            except Exception:
                 pass
-        
+
         self.log("Server shutdown complete", 1)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Chat Server')
     parser.add_argument('-p', '--port', type=int, required=True, help='Port number')
-    parser.add_argument('-d', '--debug', type=int, choices=[0, 1], default=0, 
+    parser.add_argument('-d', '--debug', type=int, choices=[0, 1], default=0,
                         help='Debug level (0=errors only, 1=all events)')
-    
+
     args = parser.parse_args()
-    
+
+    if uvloop is not None:
+        uvloop.install()
+
     server = ChatServer(args.port, args.debug)
-    server.start()
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        server.log("\nReceived Ctrl-C, shutting down...", 1)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,13 +1,31 @@
 import json
+import sys
 import time
-from enum import Enum
 
-class MessageType(str, Enum):
+try:
+    import orjson  # optional C-accelerated JSON codec; stdlib json otherwise
+except ImportError:
+    orjson = None
+
+# Reused compact encoder: json.dumps(..., separators=...) constructs a new
+# JSONEncoder on every call, so the wire hot path shares this one instead.
+# (json.loads with no kwargs already reuses the module's cached decoder.)
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Plain string constants: these used to be str Enums, but they carry no
+# behavior, and Enum member/.value lookups and MessageType(...) construction
+# were pure overhead on the per-message hot path.
+
+class MessageType:
     COMMAND = "command"
     RESPONSE = "response"
     EVENT = "event"
 
-class CommandName(str, Enum):
+_VALID_TYPES = frozenset(
+    {MessageType.COMMAND, MessageType.RESPONSE, MessageType.EVENT}
+)
+
+class CommandName:
     """Commands that travel on the wire (client -> server)."""
 
     CONNECT = "connect" #/connect <server-name> [port#]
@@ -20,7 +38,7 @@ class CommandName(str, Enum):
     MSG = "msg"        # plain chat text after joining a channel
 
 
-class EventName(str, Enum):
+class EventName:
     """Events that the server sends to clients (server -> client)."""
 
     MESSAGE = "message"          # someone sent a chat message
@@ -37,6 +55,8 @@ class Message:
     'data' must be JSON-serializable.
     """
 
+    __slots__ = ("type", "name", "data")
+
     def __init__(self, type, name, data):
         # Store the message fields.
         self.type = type   #e.g. MessageType.COMMAND
@@ -48,7 +68,7 @@ class Message:
         Convert the Message object into a JSON-serializable dictionary.
         """
         return {
-            "type": self.type.value,  # "command" / "response" / "event"
+            "type": self.type,   # "command" / "response" / "event"
             "name": self.name,    # "join", "msg", etc.
             "data": self.data,   #payload dict
         }
@@ -57,21 +77,48 @@ class Message:
     def from_dict(cls, raw):
         """
         Build a Message instance from a dictionary received over the network.
+
+        Validates with explicit checks instead of try/except: exception
+        setup costs even when nothing is raised, and this runs for every
+        inbound frame.
         """
-        try:
-            mtype = MessageType(raw["type"])
-            name = raw["name"]
-            data = raw.get("data", {}) or {}
-        except (KeyError, ValueError, TypeError) as e:
-            raise ValueError(f"Invalid message object: {raw!r}") from e
+        if not isinstance(raw, dict):
+            raise ValueError(f"Invalid message object: {raw!r}")
+
+        mtype = raw.get("type")
+        if not isinstance(mtype, str) or mtype not in _VALID_TYPES:
+            raise ValueError(f"Invalid message object: {raw!r}")
+
+        name = raw.get("name")
+        if not isinstance(name, str):
+            raise ValueError(f"Invalid message object: {raw!r}")
+
+        data = raw.get("data") or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"Invalid message object: {raw!r}")
+
+        # Intern the high-repetition identifier fields: chat traffic reuses
+        # a small set of channel names and nicknames across many messages,
+        # so sharing one str object per value saves memory and lets dict
+        # lookups keyed on them short-circuit on identity.
+        channel = data.get("channel")
+        if isinstance(channel, str):
+            data["channel"] = sys.intern(channel)
+        sender = data.get("from")
+        if isinstance(sender, str):
+            data["from"] = sys.intern(sender)
 
         return cls(mtype, name, data)
 
     def __repr__(self):
         """
         String representation for debugging.
+
+        type and name are plain strings, so they are interpolated directly;
+        only the data dict pays for a repr() call. This runs per message on
+        the debug-level-1 log path, so it is kept deliberately cheap.
         """
-        return f"Message(type={self.type!r}, name={self.name!r}, data={self.data!r})"
+        return "Message(type=%s, name=%s, data=%r)" % (self.type, self.name, self.data)
 
 
 # Protocol helpers
@@ -92,8 +139,36 @@ class Protocol:
         Uses newline-delimited JSON (NDJSON):
             b'{"type":"command","name":"join","data":{"channel":"cats"}}\\n'
         """
-        text = json.dumps(msg.to_dict(), separators=(",", ":"))
-        return (text + "\n").encode("utf-8")
+        # Build the wire dict inline rather than via msg.to_dict(): one
+        # method call less per outbound message on the fan-out hot path
+        wire = {"type": msg.type, "name": msg.name, "data": msg.data}
+        if orjson is not None:
+            # orjson emits compact bytes directly, skipping the str->bytes hop
+            return orjson.dumps(wire) + b"\n"
+        return (_JSON_ENCODER.encode(wire) + "\n").encode("utf-8")
+
+    @staticmethod
+    def encode_str(value):
+        """
+        Serialize one string to its JSON literal (quotes included), using
+        the same codec as encode(). Cached literals handed to
+        evt_message_fast must be built with this: stdlib json escapes
+        non-ASCII as \\uXXXX while orjson emits raw UTF-8, so mixing
+        codecs would produce different bytes for the same field.
+        """
+        if orjson is not None:
+            return orjson.dumps(value).decode("utf-8")
+        return json.dumps(value)
+
+    @staticmethod
+    def encode_once(msg):
+        """
+        Alias of encode() whose name spells out the broadcast contract:
+        when fanning one message out to many sockets, encode it a single
+        time and write the same bytes to every recipient. Re-encoding per
+        recipient turns an O(1) serialization into O(N).
+        """
+        return Protocol.encode(msg)
 
     @staticmethod
     def decode(line):
@@ -101,12 +176,12 @@ class Protocol:
         Decode a line of text or bytes from the wire into a Message.
 
         Caller is responsible for reading a full line (ending in '\\n').
+        Bytes are passed straight to the JSON parser, so receive paths can
+        hand over raw buffer slices without an explicit UTF-8 decode step.
         """
-        if isinstance(line, bytes):
-            line = line.decode("utf-8")
         try:
-            raw = json.loads(line)
-        except json.JSONDecodeError as e:
+            raw = orjson.loads(line) if orjson is not None else json.loads(line)
+        except ValueError as e:
             raise ValueError(f"Invalid JSON from peer: {line!r}") from e
         return Message.from_dict(raw)
 
@@ -120,7 +195,7 @@ class Protocol:
         """
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.CONNECT.value,
+            name=CommandName.CONNECT,
             data={"server": server, "port": port},
         )
 
@@ -131,7 +206,7 @@ class Protocol:
         """
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.NICK.value,
+            name=CommandName.NICK,
             data={"nickname": nickname},
         )
 
@@ -142,7 +217,7 @@ class Protocol:
         """
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.LIST.value,
+            name=CommandName.LIST,
             data={},
         )
 
@@ -153,7 +228,7 @@ class Protocol:
         """
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.JOIN.value,
+            name=CommandName.JOIN,
             data={"channel": channel},
         )
 
@@ -168,7 +243,7 @@ class Protocol:
             data["channel"] = channel
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.LEAVE.value,
+            name=CommandName.LEAVE,
             data=data,
         )
 
@@ -182,7 +257,7 @@ class Protocol:
             data["reason"] = reason
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.QUIT.value,
+            name=CommandName.QUIT,
             data=data,
         )
 
@@ -193,10 +268,25 @@ class Protocol:
         """
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.HELP.value,
+            name=CommandName.HELP,
             data={},
         )
 
+    @staticmethod
+    def cmd_list_bytes():
+        """Pre-encoded /list frame, for callers that send it immediately."""
+        return _CMD_LIST_BYTES
+
+    @staticmethod
+    def cmd_help_bytes():
+        """Pre-encoded /help frame, for callers that send it immediately."""
+        return _CMD_HELP_BYTES
+
+    @staticmethod
+    def cmd_quit_bytes():
+        """Pre-encoded /quit frame (no reason), for callers that send it immediately."""
+        return _CMD_QUIT_BYTES
+
     @staticmethod
     def cmd_msg(text, channel=None):
         """
@@ -210,7 +300,7 @@ class Protocol:
             data["channel"] = channel
         return Message(
             type=MessageType.COMMAND,
-            name=CommandName.MSG.value,
+            name=CommandName.MSG,
             data=data,
         )
 
@@ -276,7 +366,7 @@ class Protocol:
         if motd:
             data["motd"] = motd
         return Protocol.resp_ok(
-            CommandName.CONNECT.value,
+            CommandName.CONNECT,
             data
         )
 
@@ -288,7 +378,7 @@ class Protocol:
         channels: list of {"name": "#channel", "users": <int>}
         """
         return Protocol.resp_ok(
-            CommandName.LIST.value,
+            CommandName.LIST,
             {"channels": channels},
         )
 
@@ -300,7 +390,7 @@ class Protocol:
         commands: list of supported commands as human-readable strings.
         """
         return Protocol.resp_ok(
-            CommandName.HELP.value,
+            CommandName.HELP,
             {"commands": commands},
         )
 
@@ -318,24 +408,44 @@ class Protocol:
                 "channel": "#cats",
                 "from": "Angel",
                 "text": "hello",
-                "timestamp": 1732305580.123   # optional
+                "timestamp": 1732305580123456789   # optional, ns since epoch
             }
         }
+
+        Timestamps are integer nanoseconds since the epoch: integers
+        encode as plain decimal digits, skipping the float formatting
+        path. Display code converts with ts / 1e9 when needed.
         """
         payload = {
             "channel": channel,
             "from": sender,
             "text": text,
-            "timestamp": timestamp or time.time(), #Defaults to now
+            "timestamp": timestamp if timestamp is not None else time.time_ns(),
         }
-        if timestamp is not None:
-            payload["timestamp"] = timestamp
         return Message(
             type=MessageType.EVENT,
-            name=EventName.MESSAGE.value,
+            name=EventName.MESSAGE,
             data=payload,
         )
 
+    @staticmethod
+    def evt_message_fast(channel_json, nick_json, text, timestamp=None):
+        """
+        Fast path for the high-volume 'message' event: build the wire bytes
+        directly, without an intermediate Message object.
+
+        channel_json / nick_json are JSON string literals pre-serialized
+        with Protocol.encode_str() that the server caches per channel /
+        per client, so the only per-message serialization left is the
+        text and the timestamp. Produces the same bytes as
+        Protocol.encode(Protocol.evt_message(...)) under either codec.
+        """
+        ts = timestamp if timestamp is not None else time.time_ns()
+        return (
+            '{"type":"event","name":"message","data":{"channel":%s,"from":%s,"text":%s,"timestamp":%s}}\n'
+            % (channel_json, nick_json, Protocol.encode_str(text), ts)
+        ).encode("utf-8")
+
     @staticmethod
     def evt_user_joined(channel, username):
         """
@@ -343,7 +453,7 @@ class Protocol:
         """
         return Message(
             type=MessageType.EVENT,
-            name=EventName.USER_JOINED.value,
+            name=EventName.USER_JOINED,
             data={"channel": channel, "user": username},
         )
 
@@ -354,7 +464,7 @@ class Protocol:
         """
         return Message(
             type=MessageType.EVENT,
-            name=EventName.USER_LEFT.value,
+            name=EventName.USER_LEFT,
             data={"channel": channel, "user": username},
         )
 
@@ -368,6 +478,13 @@ class Protocol:
             data["reason"] = reason
         return Message(
             type=MessageType.EVENT,
-            name=EventName.SERVER_SHUTDOWN.value,
+            name=EventName.SERVER_SHUTDOWN,
             data=data,
-        )
\ No newline at end of file
+        )
+
+# Pre-encoded frames for the constant zero-argument commands. Their payloads
+# never vary, so sending one is just a socket write with no per-call Message
+# construction or JSON encoding.
+_CMD_LIST_BYTES = Protocol.encode(Protocol.cmd_list())
+_CMD_HELP_BYTES = Protocol.encode(Protocol.cmd_help())
+_CMD_QUIT_BYTES = Protocol.encode(Protocol.cmd_quit())